@@ -4,7 +4,6 @@ from ui.settings import SettingsTab
 
 import os
 from services.twitch.credentials import TwitchCredentialsManager
-from dotenv import load_dotenv
 import sys
 
 class MainApp(tk.Tk):
@@ -26,6 +25,7 @@ class MainApp(tk.Tk):
 
 if __name__ == "__main__":
     if '--set-twitch-credentials' in sys.argv:
+        from dotenv import load_dotenv  # Only needed for this one-off CLI path
         load_dotenv()
         client_id = os.getenv('TWITCH_CLIENT_ID')
         client_secret = os.getenv('TWITCH_CLIENT_SECRET')
@@ -3,32 +3,41 @@ import os
 
 class SettingsManager:
     SETTINGS_FILE = 'settings.json'
+    DEFAULT_OBS_WEBSOCKET_CONFIG = {
+        'host': 'localhost',
+        'port': 4455,
+        'password': ''
+    }
 
     def __init__(self):
         self.settings = self._load_settings()
 
     def _load_settings(self):
-        if os.path.exists(self.SETTINGS_FILE):
-            try:
-                with open(self.SETTINGS_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {}
+        try:
+            with open(self.SETTINGS_FILE, 'rb') as f:
+                return json.loads(f.read())
+        except Exception:
+            return {}
 
     def save_settings(self):
+        tmp_file = self.SETTINGS_FILE + '.tmp'
         try:
-            with open(self.SETTINGS_FILE, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            # Write a synced temp file, then swap it in atomically
+            data = json.dumps(self.settings, indent=4)
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.SETTINGS_FILE)
         except Exception:
-            pass
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
 
     def get_obs_websocket_config(self):
-        return self.settings.get('obs_websocket', {
-            'host': 'localhost',
-            'port': 4455,
-            'password': ''
-        })
+        config = self.settings.get('obs_websocket', {})
+        return {**self.DEFAULT_OBS_WEBSOCKET_CONFIG, **config}
 
     def set_obs_websocket_config(self, host, port, password):
         self.settings['obs_websocket'] = {
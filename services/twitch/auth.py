@@ -1,6 +1,5 @@
 import asyncio
 from twitchAPI.twitch import Twitch
-from twitchAPI.oauth import UserAuthenticationStorageHelper
 from twitchAPI.type import AuthScope
 from pathlib import Path
 from services.twitch.credentials import TwitchCredentialsManager
@@ -29,6 +28,44 @@ OAUTH_BROADCASTER_PORT = 17563  # Changed to match first port
 OAUTH_BOT_PORT = 17564  # Changed to match second port
 OAUTH_TIMEOUT_SECONDS = 300  # 5 minutes
 
+# OAuth scopes requested for each account type
+BROADCASTER_SCOPES = [
+    AuthScope.CHANNEL_READ_REDEMPTIONS,
+    AuthScope.CHANNEL_MANAGE_REDEMPTIONS,
+    AuthScope.CHANNEL_READ_SUBSCRIPTIONS,
+    AuthScope.CHANNEL_MANAGE_BROADCAST,
+    AuthScope.CHANNEL_READ_POLLS,
+    AuthScope.CHANNEL_MANAGE_POLLS,
+    AuthScope.CHANNEL_READ_PREDICTIONS,
+    AuthScope.CHANNEL_MANAGE_PREDICTIONS,
+    AuthScope.CHANNEL_MANAGE_SCHEDULE,
+    AuthScope.USER_READ_BROADCAST,
+    AuthScope.USER_READ_CHAT,
+    AuthScope.CHAT_EDIT,
+    AuthScope.CHAT_READ,
+    AuthScope.MODERATION_READ,
+    AuthScope.MODERATOR_MANAGE_BANNED_USERS,
+    AuthScope.MODERATOR_MANAGE_CHAT_SETTINGS,
+    AuthScope.MODERATOR_READ_CHAT_SETTINGS,
+    AuthScope.MODERATOR_MANAGE_ANNOUNCEMENTS,
+    AuthScope.MODERATOR_MANAGE_CHAT_MESSAGES,
+    AuthScope.MODERATOR_READ_CHAT_MESSAGES,
+    # Add more as needed for streamer.bot alternative
+]
+BOT_SCOPES = [
+    AuthScope.CHAT_READ,
+    AuthScope.CHAT_EDIT,
+    AuthScope.USER_READ_CHAT,
+    AuthScope.MODERATION_READ,
+    AuthScope.MODERATOR_MANAGE_BANNED_USERS,
+    AuthScope.MODERATOR_MANAGE_CHAT_SETTINGS,
+    AuthScope.MODERATOR_READ_CHAT_SETTINGS,
+    AuthScope.MODERATOR_MANAGE_ANNOUNCEMENTS,
+    AuthScope.MODERATOR_MANAGE_CHAT_MESSAGES,
+    AuthScope.MODERATOR_READ_CHAT_MESSAGES,
+    # Add more as needed for bot automation/moderation
+]
+
 def is_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
@@ -38,7 +75,25 @@ class OAuthResult:
         self.code = None
         self.error = None
         self.error_description = None
+        self.cancelled = False
         self.event = threading.Event()
+        self._waiters = []  # (loop, asyncio.Event) pairs awaiting the result
+
+    def set(self):
+        """Mark the result as ready and wake every coroutine awaiting it"""
+        self.event.set()
+        for loop, waiter in self._waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    async def wait(self):
+        """Wait for the result without polling, from any event loop"""
+        waiter = asyncio.Event()
+        self._waiters.append((asyncio.get_running_loop(), waiter))
+        if not self.event.is_set():
+            await waiter.wait()
 
 class TwitchAuthManager:
     _active_login = {}  # class-level dict to prevent parallel logins per port
@@ -53,58 +108,35 @@ class TwitchAuthManager:
             asyncio.set_event_loop(cls._event_loop)
         return cls._event_loop
 
+    @classmethod
+    async def _cleanup_runners(cls):
+        """Shut down every tracked aiohttp runner"""
+        for runner in cls._aiohttp_runners:
+            try:
+                await runner.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up runner: {e}")
+
     def __init__(self, account_type='broadcaster', on_timeout=None):
         self.account_type = account_type  # 'broadcaster' or 'bot'
         self.token_file = f'twitch_{account_type}_token.json'
         if self.account_type == 'broadcaster':
-            self.scopes = [
-                AuthScope.CHANNEL_READ_REDEMPTIONS,
-                AuthScope.CHANNEL_MANAGE_REDEMPTIONS,
-                AuthScope.CHANNEL_READ_SUBSCRIPTIONS,
-                AuthScope.CHANNEL_MANAGE_BROADCAST,
-                AuthScope.CHANNEL_READ_POLLS,
-                AuthScope.CHANNEL_MANAGE_POLLS,
-                AuthScope.CHANNEL_READ_PREDICTIONS,
-                AuthScope.CHANNEL_MANAGE_PREDICTIONS,
-                AuthScope.CHANNEL_MANAGE_SCHEDULE,
-                AuthScope.USER_READ_BROADCAST,
-                AuthScope.USER_READ_CHAT,
-                AuthScope.CHAT_EDIT,
-                AuthScope.CHAT_READ,
-                AuthScope.MODERATION_READ,
-                AuthScope.MODERATOR_MANAGE_BANNED_USERS,
-                AuthScope.MODERATOR_MANAGE_CHAT_SETTINGS,
-                AuthScope.MODERATOR_READ_CHAT_SETTINGS,
-                AuthScope.MODERATOR_MANAGE_ANNOUNCEMENTS,
-                AuthScope.MODERATOR_MANAGE_CHAT_MESSAGES,
-                AuthScope.MODERATOR_READ_CHAT_MESSAGES,
-                # Add more as needed for streamer.bot alternative
-            ]
+            self.scopes = BROADCASTER_SCOPES
             self.oauth_port = OAUTH_BROADCASTER_PORT
         else:  # bot
-            self.scopes = [
-                AuthScope.CHAT_READ,
-                AuthScope.CHAT_EDIT,
-                AuthScope.USER_READ_CHAT,
-                AuthScope.MODERATION_READ,
-                AuthScope.MODERATOR_MANAGE_BANNED_USERS,
-                AuthScope.MODERATOR_MANAGE_CHAT_SETTINGS,
-                AuthScope.MODERATOR_READ_CHAT_SETTINGS,
-                AuthScope.MODERATOR_MANAGE_ANNOUNCEMENTS,
-                AuthScope.MODERATOR_MANAGE_CHAT_MESSAGES,
-                AuthScope.MODERATOR_READ_CHAT_MESSAGES,
-                # Add more as needed for bot automation/moderation
-            ]
+            self.scopes = BOT_SCOPES
             self.oauth_port = OAUTH_BOT_PORT
         self.credentials_manager = TwitchCredentialsManager()
         self.twitch = None
         self.helper = None
         self.oauth_timer = None
         self.on_timeout = on_timeout
-        self._login_cancelled = False
         self._oauth_result = None
+        # The token file is only written by login() and removed by logout(),
+        # so its presence is checked once and tracked in memory afterwards
+        self._logged_in = Path(self.token_file).exists()
         # Persistent login: restore tokens if file exists
-        if Path(self.token_file).exists():
+        if self._logged_in:
             try:
                 with open(self.token_file, 'r') as f:
                     token_data = json.load(f)
@@ -138,7 +170,7 @@ class TwitchAuthManager:
                 logger.error(f"Received OAuth error: {error} - {error_description}")
                 oauth_result.error = error
                 oauth_result.error_description = error_description
-                oauth_result.event.set()
+                oauth_result.set()
                 html = """
                 <html><head><title>OBS Copilot Login Error</title></head>
                 <body style='font-family:sans-serif;text-align:center;margin-top:10em;'>
@@ -153,7 +185,7 @@ class TwitchAuthManager:
             if code:
                 logger.info("Received OAuth code")
                 oauth_result.code = code
-                oauth_result.event.set()
+                oauth_result.set()
                 html = """
                 <html><head><title>OBS Copilot Login</title></head>
                 <body style='font-family:sans-serif;text-align:center;margin-top:10em;'>
@@ -192,8 +224,8 @@ class TwitchAuthManager:
             logger.error(f"Failed to start server on port {port}: {e}")
             raise RuntimeError(f"Could not start HTTP server on port {port}: {e}")
             
-        while not oauth_result.event.is_set() and not self._login_cancelled:
-            await asyncio.sleep(0.1)
+        # Cancellation, timeout and cleanup all resolve the result too
+        await oauth_result.wait()
 
     def _start_servers_and_browser(self, oauth_result, oauth_url):
         """Start HTTP server and open browser"""
@@ -203,16 +235,10 @@ class TwitchAuthManager:
                 loop.run_until_complete(self._setup_aiohttp_servers(oauth_result, self.oauth_port))
             except Exception as e:
                 logger.error(f"Server thread error: {e}")
-                oauth_result.event.set()
+                oauth_result.set()
             finally:
-                async def cleanup_runners():
-                    for runner in TwitchAuthManager._aiohttp_runners:
-                        try:
-                            await runner.cleanup()
-                        except Exception as e:
-                            logger.error(f"Error cleaning up runner: {e}")
                 try:
-                    loop.run_until_complete(cleanup_runners())
+                    loop.run_until_complete(TwitchAuthManager._cleanup_runners())
                 except Exception as e:
                     logger.error(f"Error in cleanup: {e}")
                 finally:
@@ -254,34 +280,33 @@ class TwitchAuthManager:
                 f'&force_verify=true'
             )
             
-            self._login_cancelled = False
-            self._oauth_result = OAuthResult()
+            # Keep a local reference: cleanup may clear self._oauth_result while we wait
+            oauth_result = self._oauth_result = OAuthResult()
             
             logger.info(f"Starting server thread for port {self.oauth_port}")
-            server_thread = self._start_servers_and_browser(self._oauth_result, oauth_url)
+            server_thread = self._start_servers_and_browser(oauth_result, oauth_url)
             
             self.oauth_timer = threading.Timer(OAUTH_TIMEOUT_SECONDS, self._timeout_handler, args=(None,))
             self.oauth_timer.start()
             
             try:
                 logger.info("Waiting for OAuth response")
-                while not self._oauth_result.event.is_set() and not self._login_cancelled:
-                    await asyncio.sleep(0.1)
+                await oauth_result.wait()
                     
-                if self._login_cancelled:
+                if oauth_result.cancelled:
                     logger.info("Login was cancelled")
                     raise RuntimeError("Login was cancelled.")
                     
-                if self._oauth_result.error:
-                    error_msg = f"Twitch OAuth error: {self._oauth_result.error}"
-                    if self._oauth_result.error_description:
-                        error_msg += f" - {self._oauth_result.error_description}"
+                if oauth_result.error:
+                    error_msg = f"Twitch OAuth error: {oauth_result.error}"
+                    if oauth_result.error_description:
+                        error_msg += f" - {oauth_result.error_description}"
                     logger.error(error_msg)
-                    if self._oauth_result.error == "redirect_mismatch":
+                    if oauth_result.error == "redirect_mismatch":
                         error_msg += "\nPlease ensure the redirect URI matches exactly what is registered in your Twitch application settings."
                     raise RuntimeError(error_msg)
                     
-                if not self._oauth_result.code:
+                if not oauth_result.code:
                     logger.error("No code received from Twitch")
                     raise RuntimeError("No code received from Twitch.")
                     
@@ -292,7 +317,7 @@ class TwitchAuthManager:
                         payload = {
                             "client_id": client_id,
                             "client_secret": client_secret,
-                            "code": self._oauth_result.code,
+                            "code": oauth_result.code,
                             "grant_type": "authorization_code",
                             "redirect_uri": redirect_url
                         }
@@ -313,13 +338,14 @@ class TwitchAuthManager:
                     
                 logger.info("OAuth login successful")
                 
-                # Save tokens to file so is_logged_in() works
+                # Save tokens to file so the login persists across restarts
                 with open(self.token_file, 'w') as f:
                     json.dump({
                         'access_token': token_data['access_token'],
                         'refresh_token': token_data['refresh_token'],
                         'scopes': [s.value for s in self.scopes]
                     }, f)
+                self._logged_in = True
                 
                 return self.twitch
             except Exception as e:
@@ -334,16 +360,20 @@ class TwitchAuthManager:
 
     def cancel_login(self):
         logger.info(f"Cancelling login on port {self.oauth_port}")
-        self._login_cancelled = True
         if self.oauth_timer:
             self.oauth_timer.cancel()
+        if self._oauth_result:
+            self._oauth_result.cancelled = True
+            self._oauth_result.set()
         asyncio.run(self._cleanup_login())
 
     def _timeout_handler(self, _):
         logger.info(f"OAuth login timed out after {OAUTH_TIMEOUT_SECONDS} seconds on port {self.oauth_port}")
-        self._login_cancelled = True
         if self.oauth_timer:
             self.oauth_timer.cancel()
+        if self._oauth_result:
+            self._oauth_result.cancelled = True
+            self._oauth_result.set()
         asyncio.run(self._cleanup_login())
         if self.on_timeout:
             self.on_timeout()
@@ -352,26 +382,21 @@ class TwitchAuthManager:
         logger.info(f"Cleaning up login state for port {self.oauth_port}")
         TwitchAuthManager._active_login[self.oauth_port] = False
         self.oauth_timer = None
-        self._login_cancelled = False
+        if self._oauth_result:
+            self._oauth_result.set()  # Release the callback server
         self._oauth_result = None
         
-        async def cleanup_runners():
-            for runner in TwitchAuthManager._aiohttp_runners:
-                try:
-                    await runner.cleanup()
-                except Exception as e:
-                    logger.error(f"Error cleaning up runner: {e}")
-        
         try:
-            await cleanup_runners()
+            await TwitchAuthManager._cleanup_runners()
         finally:
             TwitchAuthManager._aiohttp_runners = []
 
     def is_logged_in(self):
-        return Path(self.token_file).exists()
+        return self._logged_in
 
     def logout(self):
         logger.info(f"Logging out {self.account_type} account")
         if Path(self.token_file).exists():
             Path(self.token_file).unlink()
+        self._logged_in = False
         asyncio.run(self._cleanup_login()) 
\ No newline at end of file
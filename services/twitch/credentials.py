@@ -4,18 +4,25 @@ from cryptography.fernet import Fernet
 class TwitchCredentialsManager:
     KEY_FILE = 'twitch_app.key'
     ENCRYPTED_CREDENTIALS_FILE = 'twitch_app_credentials.enc'
+    _key_cache = {}  # path -> key
 
     def __init__(self):
         self.key = self._load_or_create_key()
         self.fernet = Fernet(self.key)
 
     def _load_or_create_key(self):
+        # Every auth manager builds its own credentials manager; share the key
+        key = self._key_cache.get(self.KEY_FILE)
+        if key is not None:
+            return key
         if os.path.exists(self.KEY_FILE):
             with open(self.KEY_FILE, 'rb') as f:
-                return f.read()
-        key = Fernet.generate_key()
-        with open(self.KEY_FILE, 'wb') as f:
-            f.write(key)
+                key = f.read()
+        else:
+            key = Fernet.generate_key()
+            with open(self.KEY_FILE, 'wb') as f:
+                f.write(key)
+        self._key_cache[self.KEY_FILE] = key
         return key
 
     def save_credentials(self, client_id, client_secret):
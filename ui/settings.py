@@ -1,22 +1,36 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from threading import Thread
+import queue
 from services.obs_websocket import OBSWebSocketService
 from services.settings_manager import SettingsManager
 from ui.twitch.login import TwitchLoginFrame
 
+SETTINGS_SAVE_DELAY_MS = 500  # Quiet period before edited settings are written
+WORKER_POLL_INTERVAL_MS = 100  # How often the Tk thread checks for a pending connect result
+CONNECTED_POLL_INTERVAL_MS = 2000  # Matches the OBS monitor's own check interval
+
 class OBSWebSocketConfig(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.connected = False
+        self._save_after_id = None
+        self._connecting = False
+        # Worker threads must not call into Tcl (not even after()): before
+        # mainloop() starts that raises "main thread is not in main loop".
+        # They hand results over through this queue, polled on the Tk thread.
+        self._worker_results = queue.Queue()
+        self._poll_after_id = None
         self.ws_service = OBSWebSocketService()
         self.settings_manager = SettingsManager()
         self._build_ui()
         self._load_settings()
         self._try_autoconnect()
         self._register_close_handler()
-        # Wire up disconnect callback
-        self.ws_service.on_disconnect = self._on_obs_disconnect
+        # Wire up disconnect callback; it fires on the monitor thread, so hand
+        # it to the Tk thread before touching any widgets
+        self.ws_service.on_disconnect = lambda: self._worker_results.put(self._on_obs_disconnect)
 
     def _build_ui(self):
         # Host
@@ -42,40 +56,106 @@ class OBSWebSocketConfig(ttk.Frame):
 
     def _load_settings(self):
         config = self.settings_manager.get_obs_websocket_config()
-        self.host_var.set(config.get('host', 'localhost'))
-        self.port_var.set(config.get('port', 4455))
-        self.password_var.set(config.get('password', ''))
+        self.host_var.set(config['host'])
+        self.port_var.set(config['port'])
+        self.password_var.set(config['password'])
 
     def _try_autoconnect(self):
-        if self.settings_manager.get_obs_autoconnect():
-            host = self.host_var.get()
-            port = self.port_var.get()
-            password = self.password_var.get()
+        # Bail out before spawning a connect thread that could only fail
+        if not self.settings_manager.get_obs_autoconnect() or not self.ws_service.is_available():
+            return
+        host = self.host_var.get()
+        port = self.port_var.get()
+        password = self.password_var.get()
+        self._connect_in_background(host, port, password, "Connected (auto)", show_errors=False)
+
+    def _connect_in_background(self, host, port, password, connected_text, show_errors):
+        # obsws.connect() blocks on the network; keep the Tk mainloop responsive
+        self._connecting = True
+        self.connect_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Connecting...", foreground="orange")
+        def do_connect():
             try:
                 self.ws_service.connect(host, port, password)
-                self.connected = True
-                self.connect_btn.config(text="Disconnect", command=self._on_disconnect)
-                self.status_label.config(text="Connected (auto)", foreground="green")
-            except Exception:
-                self.connected = False
-                self.connect_btn.config(text="Connect", command=self._on_connect)
-                self.status_label.config(text="Not connected", foreground="red")
+            except Exception as e:
+                self._worker_results.put(lambda err=e: self._on_connect_failed(err, show_errors))
+            else:
+                self._worker_results.put(lambda: self._on_connect_succeeded(connected_text))
+        Thread(target=do_connect, daemon=True).start()
+        self._schedule_poll()
+
+    def _schedule_poll(self):
+        # Poll quickly while a connect is pending; once connected only the
+        # monitor can report anything, and it checks no faster than this
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        if self._connecting:
+            self._poll_after_id = self.after(WORKER_POLL_INTERVAL_MS, self._poll_worker_results)
+        elif self.connected:
+            self._poll_after_id = self.after(CONNECTED_POLL_INTERVAL_MS, self._poll_worker_results)
+
+    def _poll_worker_results(self):
+        self._poll_after_id = None
+        while True:
+            try:
+                handler = self._worker_results.get_nowait()
+            except queue.Empty:
+                break
+            handler()
+        self._schedule_poll()
+
+    def _set_connection_state(self, connected, status_text="Not connected"):
+        # Single place that keeps the flag, button and status label in sync
+        self.connected = connected
+        if connected:
+            self.connect_btn.config(text="Disconnect", command=self._on_disconnect, state=tk.NORMAL)
+            self.status_label.config(text=status_text, foreground="green")
+        else:
+            self.connect_btn.config(text="Connect", command=self._on_connect, state=tk.NORMAL)
+            self.status_label.config(text=status_text, foreground="red")
+
+    def _on_connect_succeeded(self, connected_text):
+        self._connecting = False
+        self._set_connection_state(True, connected_text)
+
+    def _on_connect_failed(self, error, show_errors):
+        self._connecting = False
+        self._set_connection_state(False)
+        if show_errors:
+            messagebox.showerror("Connection Error", str(error))
 
     def _register_close_handler(self):
         root = self.winfo_toplevel()
         self._orig_close_handler = root.protocol("WM_DELETE_WINDOW", self._on_app_close)
 
     def _on_app_close(self):
-        # Set auto-connect ON if connected, OFF if not connected
-        self.settings_manager.set_obs_autoconnect(self.connected)
+        # Flush any pending settings write before exiting
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+            self._save_settings()
+        # Set auto-connect ON if connected, OFF if not connected; a connect
+        # still in flight counts as connected since that was the user's intent
+        self.settings_manager.set_obs_autoconnect(self.connected or self._connecting)
         root = self.winfo_toplevel()
         root.destroy()
 
     def _on_settings_change(self, *args):
-        # Save settings automatically when any field changes
+        # Save settings automatically when any field changes, coalescing a
+        # burst of keystrokes into a single write once typing pauses
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+        self._save_after_id = self.after(SETTINGS_SAVE_DELAY_MS, self._save_settings)
+
+    def _save_settings(self):
+        self._save_after_id = None
+        try:
+            port = self.port_var.get()
+        except tk.TclError:
+            return  # Port field is empty or not a number yet
         self.settings_manager.set_obs_websocket_config(
             self.host_var.get(),
-            self.port_var.get(),
+            port,
             self.password_var.get()
         )
 
@@ -87,13 +167,7 @@ class OBSWebSocketConfig(ttk.Frame):
             host = self.host_var.get()
             port = self.port_var.get()
             password = self.password_var.get()
-            try:
-                self.ws_service.connect(host, port, password)
-                self.connected = True
-                self.connect_btn.config(text="Disconnect", command=self._on_disconnect)
-                self.status_label.config(text="Connected", foreground="green")
-            except Exception as e:
-                messagebox.showerror("Connection Error", str(e))
+            self._connect_in_background(host, port, password, "Connected", show_errors=True)
         else:
             self._on_disconnect()
 
@@ -102,14 +176,13 @@ class OBSWebSocketConfig(ttk.Frame):
             self.ws_service.disconnect()
         except Exception:
             pass
-        self.connected = False
-        self.connect_btn.config(text="Connect", command=self._on_connect)
-        self.status_label.config(text="Not connected", foreground="red")
+        self._set_connection_state(False)
 
     def _on_obs_disconnect(self):
-        self.connected = False
-        self.connect_btn.config(text="Connect", command=self._on_connect)
-        self.status_label.config(text="Not connected", foreground="red")
+        # A drop reported for a connection the user already closed is stale
+        if not self.connected:
+            return
+        self._set_connection_state(False)
         messagebox.showwarning("OBS Disconnected", "Lost connection to OBS. Please make sure OBS is running and try reconnecting.")
 
 class SettingsTab(ttk.Frame):